@@ -25,10 +25,11 @@ limitations under the License.
 
 """
 
-from numpy import array, double
+from numpy import array, double, zeros
 from sympy import symbols, Symbol
 
 from skimpy.utils.compile_sympy import make_cython_function
+from skimpy.analysis.ode.symbolic_jacobian_fun import make_symbolic_jacobian
 from skimpy.utils.general import robust_index
 from ...utils.tabdict import TabDict
 from warnings import warn
@@ -36,7 +37,8 @@ from warnings import warn
 
 class ODEFunction:
     def __init__(self, model, variables, expressions, parameters,
-                 pool=None, with_time=False, custom_ode_update=None):
+                 pool=None, with_time=False, custom_ode_update=None,
+                 global_cse=False):
         """
         Constructor for a precompiled function to solve the ode epxressions
         numerically
@@ -44,7 +46,27 @@ class ODEFunction:
         :param expressions: dict of sympy expressions for the rate of
                      change of a variable indexed by the variable name
         :param parameters: dict of parameters
+        :param global_cse: eliminate common sub expressions across all
+                     expressions instead of per expression (not parallelized)
 
+        """
+        sym_vars = self._link_model(model, variables, expressions, parameters,
+                                    with_time=with_time,
+                                    custom_ode_update=custom_ode_update)
+        self.global_cse = global_cse
+
+        # Sort the expressions
+        expressions = [self.expressions[x] for x in self.variables.values()]
+
+        # Awsome magic
+        self.function = make_cython_function(sym_vars, expressions, simplify=True, pool=pool,
+                                             global_cse=global_cse)
+
+    def _link_model(self, model, variables, expressions, parameters,
+                    with_time=False, custom_ode_update=None):
+        """
+        Link the function to the model and get the symbols of the inputs
+        of the compiled function, ordered as [(t,) variables, parameters]
         """
         self.variables = variables
         self.expressions = expressions
@@ -61,13 +83,7 @@ class ODEFunction:
         if with_time:
             the_variable_keys = ['t',] + the_variable_keys
 
-        sym_vars = list(symbols(the_variable_keys+the_param_keys))
-
-        # Sort the expressions
-        expressions = [self.expressions[x] for x in self.variables.values()]
-
-        # Awsome magic
-        self.function = make_cython_function(sym_vars, expressions, simplify=True, pool=pool)
+        return list(symbols(the_variable_keys+the_param_keys))
 
     @property
     def parameters(self):
@@ -80,14 +96,83 @@ class ODEFunction:
         self._parameters = value
 
     def get_params(self):
-        self._parameters_values = self.parameters.values()
+        self._parameters_values = array(list(self.parameters.values()),
+                                        dtype=double)
+        # Preallocate the input vector [(t,) y, parameters] once per solve
+        # the parameters are fixed during the integration so only the
+        # state needs to be written at each rhs call
+        num_vars = len(self.variables)
+        offset = num_vars + 1 if self.with_time else num_vars
+        self._input_array = zeros(offset + len(self._parameters_values),
+                                  dtype=double)
+        self._input_array[offset:] = self._parameters_values
 
     def __call__(self, t, y, ydot):
         if self.with_time:
-            input_vars = [t,]+list(y)+list(self._parameters_values)
+            self._input_array[0] = t
+            self._input_array[1:len(y)+1] = y
         else:
-            input_vars = list(y)+list(self._parameters_values)
-        self.function(input_vars, ydot)
+            self._input_array[:len(y)] = y
+        self.function(self._input_array, ydot)
         
         if not self.custom_ode_update is None:
             self.custom_ode_update( t, y, ydot)
+
+
+class ODEJacobianFunction(ODEFunction):
+    def __init__(self, model, variables, expressions, parameters, pool=None,
+                 global_cse=False):
+        """
+        Constructor for a precompiled function to evaluate the jacobian of
+        the ode expressions, in the form expected by the jacfn option
+        of the cvode solver
+        :param variables: a list of strings with variables names
+        :param expressions: dict of sympy expressions for the rate of
+                     change of a variable indexed by the variable name
+        :param parameters: dict of parameters
+        :param global_cse: eliminate common sub expressions across all
+                     entries instead of per entry (not parallelized)
+
+        """
+        sym_vars = self._link_model(model, variables, expressions, parameters)
+        self.global_cse = global_cse
+
+        # Only the non zero entries are compiled, make_symbolic_jacobian
+        # indexes the derivative of the j-th expression with respect to
+        # the i-th variable as (i,j)
+        jacobian = make_symbolic_jacobian(self.variables.values(),
+                                          self.expressions,
+                                          pool=pool)
+
+        # Variables held by a boundary condition are also parameters, the
+        # compiled ode function reads them from the parameter inputs so
+        # their columns of the jacobian are zero
+        fixed_columns = {i for i, k in enumerate(self.variables)
+                         if k in self._parameters}
+        jacobian = {(i, j): e for (i, j), e in jacobian.items()
+                    if i not in fixed_columns}
+
+        columns = [i for i, j in jacobian.keys()]
+        rows = [j for i, j in jacobian.keys()]
+        jacobian_expressions = list(jacobian.values())
+
+        self.rows = array(rows, dtype=int)
+        self.columns = array(columns, dtype=int)
+        self._values = zeros(len(jacobian_expressions), dtype=double)
+
+        # Nothing to compile if the jacobian has no non zero entries
+        if jacobian_expressions:
+            self.function = make_cython_function(sym_vars, jacobian_expressions,
+                                                 simplify=True, pool=pool,
+                                                 global_cse=global_cse)
+        else:
+            self.function = None
+
+    def __call__(self, t, y, fy, J):
+        J[:, :] = 0.0
+
+        if self.function is not None:
+            self._input_array[:len(y)] = y
+            self.function(self._input_array, self._values)
+            J[self.rows, self.columns] = self._values
+        return 0
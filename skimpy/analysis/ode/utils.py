@@ -35,11 +35,14 @@ from skimpy.utils.namespace import *
 from skimpy.utils.general import join_dicts
 
 
-def make_ode_fun(kinetic_model, sim_type, pool=None, custom_ode_update=None):
+def make_ode_fun(kinetic_model, sim_type, pool=None, custom_ode_update=None,
+                 global_cse=False):
     """
 
     :param kinetic_model:
     :param sim_type:
+    :param global_cse: eliminate common sub expressions across all ode
+                       expressions when generating the code
     :return:
     """
     all_data = get_expressions_from_model(kinetic_model, sim_type)
@@ -47,13 +50,12 @@ def make_ode_fun(kinetic_model, sim_type, pool=None, custom_ode_update=None):
     # get expressions for dxdt
     all_expr, _, all_parameters = list(zip(*all_data))
 
-    # Flatten all the lists
-    flatten_list = lambda this_list: [item for sublist in this_list \
-                                      for item in sublist]
-
-    all_parameters = flatten_list(all_parameters)
-    all_parameters = list(set(all_parameters))
-    all_parameters = iterable_to_tabdict(all_parameters, use_name=False)
+    # Collect the parameters in a single pass, in the order of the reactions
+    # (and by name within a reaction) such that the layout of the inputs
+    # of the compiled function is reproducible
+    all_parameters = TabDict([(str(p), p)
+                              for these_parameters in all_parameters
+                              for p in sorted(these_parameters, key=str)])
 
 
     # Better since this is implemented now
@@ -88,7 +90,8 @@ def make_ode_fun(kinetic_model, sim_type, pool=None, custom_ode_update=None):
 
     # Make vector function from expressions
     ode_fun = ODEFunction(kinetic_model, variables, expr, all_parameters, pool=pool,
-                          custom_ode_update=custom_ode_update)
+                          custom_ode_update=custom_ode_update,
+                          global_cse=global_cse)
 
     return ode_fun, variables
 
@@ -118,9 +121,9 @@ def make_flux_fun(kinetic_model, sim_type):
         expr = TabDict([(r, e) for r, e in zip(reactions, all_expr)])
 
 
-    all_parameters = flatten_list(all_parameters)
-    all_parameters = list(set(all_parameters))
-    all_parameters = iterable_to_tabdict(all_parameters, use_name=False)
+    all_parameters = TabDict([(str(p), p)
+                              for these_parameters in all_parameters
+                              for p in sorted(these_parameters, key=str)])
 
     # Better since this is implemented now
     reactant_items = kinetic_model.reactants.items()
@@ -28,6 +28,7 @@ limitations under the License.
 from scikits.odes import ode
 from skimpy.analysis.ode.utils import make_ode_fun
 from skimpy.analysis.ode.utils import make_gamma_fun
+from skimpy.analysis.ode.ode_fun import ODEJacobianFunction
 from skimpy.analysis.ode.symbolic_jacobian_fun import SymbolicJacobianFunction
 
 from skimpy.analysis.mca.make import make_mca_functions
@@ -35,7 +36,7 @@ from skimpy.analysis.mca.prepare import prepare_mca
 from skimpy.analysis.mca import *
 from skimpy.analysis.mca.volume_ratio_function import VolumeRatioFunction
 from ..utils.logger import get_bistream_logger
-from .solution import ODESolution
+from .solution import ODESolution, ODESolutionPopulation
 
 from ..utils import TabDict, iterable_to_tabdict
 from ..utils.namespace import *
@@ -137,8 +138,11 @@ class KineticModel(object):
         """
         # If the variable name already exists substitute the reactant
         # with the pre-existing variable
+        # NOTE: self.reactants rebuilds the TabDict from all reactions
+        # on every access, it does not change within this loop
+        model_reactants = self.reactants
         for k,v in reaction.reactants.items():
-            if v.name in self.reactants.keys():
+            if v.name in model_reactants.keys():
 
                 # TODO substitute by itemsetter in reactions.reactants
                 # Possible reactant types for the reaction.reactant, all handled by the if/elif/else conditions in order
@@ -151,25 +155,25 @@ class KineticModel(object):
                             if this_mod.reactants['small_molecule'].name \
                                is v.name:
 
-                               this_mod.reactants['small_molecule'] = self.reactants[v.name]
+                               this_mod.reactants['small_molecule'] = model_reactants[v.name]
                 elif k.startswith('activator_'):
                     for this_mod in reaction.modifiers.values():
                         if 'activator' in this_mod.reactants.keys():
                             if this_mod.reactants['activator'].name \
                                     is v.name:
-                                this_mod.reactants['activator'] = self.reactants[v.name]
+                                this_mod.reactants['activator'] = model_reactants[v.name]
                 elif k.startswith('inhibitor_'):
                     for this_mod in reaction.modifiers.values():
                         if 'inhibitor' in this_mod.reactants.keys():
                             if this_mod.reactants['inhibitor'].name \
                                     is v.name:
-                                this_mod.reactants['inhibitor'] = self.reactants[v.name]
+                                this_mod.reactants['inhibitor'] = model_reactants[v.name]
                 elif k.startswith('inhibitor'):
                     for this_inh_name, this_inh in reaction.mechanism.inhibitors.items():
                         if this_inh.name is v.name:
-                            reaction.mechanism.inhibitors[this_inh_name] = self.reactants[v.name]
+                            reaction.mechanism.inhibitors[this_inh_name] = model_reactants[v.name]
                 else:
-                    reaction.mechanism.reactants[k] = self.reactants[v.name]
+                    reaction.mechanism.reactants[k] = model_reactants[v.name]
 
 
         self.add_to_tabdict(reaction, 'reactions')
@@ -238,17 +242,18 @@ class KineticModel(object):
         FIXME: Any idea to avoid this is dearly welcome
         :return:
         """
+        model_reactants = self.reactants
         for this_reaction in self.reactions.values():
             this_mechanism = this_reaction.mechanism
             if not this_mechanism.inhibitors is None:
                 for this_keys, this_inhibitor in this_mechanism.inhibitors.items():
-                    if this_inhibitor.name in self.reactants:
-                        this_mechanism.inhibitors[this_keys] = self.reactants[this_inhibitor.name]
+                    if this_inhibitor.name in model_reactants:
+                        this_mechanism.inhibitors[this_keys] = model_reactants[this_inhibitor.name]
 
             for this_modifier in this_reaction.modifiers.values():
                 for this_keys, this_modifier_reactant in this_modifier.reactants.items():
-                    if this_modifier_reactant.name in self.reactants:
-                        this_modifier.reactants[this_keys] = self.reactants[this_modifier_reactant.name]
+                    if this_modifier_reactant.name in model_reactants:
+                        this_modifier.reactants[this_keys] = model_reactants[this_modifier_reactant.name]
 
 
     @property
@@ -313,22 +318,57 @@ class KineticModel(object):
                                                          self.parameters,
                                                          self.pool)
 
-    def compile_ode(self, sim_type=QSSA, ncpu=1,):
+    def compile_ode(self, sim_type=QSSA, ncpu=1, jacobian=False, global_cse=False,
+                    force=False):
+        """
+        Compile the ode expressions of the model
+
+        The ode function is only regenerated if the model was modified
+        (i.e. reactions or boundary conditions were added) or if the
+        sim_type changed since the last compilation. Changes made directly
+        to the reactions of a compiled model, e.g. setting
+        reaction.modifiers or deleting a boundary condition, are not
+        tracked; use force=True to regenerate the ode function after such
+        changes.
+
+        :param sim_type:
+        :param ncpu:
+        :param jacobian: If True, also compile the analytic jacobian of the
+                         ode expressions, it is then used by the cvode
+                         solver instead of finite differences
+        :param global_cse: If True, common sub expressions are eliminated
+                         across all ode expressions (e.g. a rate shared by
+                         the mass balances of its reactants is computed
+                         once). Generates faster code but the code
+                         generation is not parallelized over ncpu
+        :param force: If True, regenerate the ode function even if the
+                         model was not modified
+        :return:
+        """
 
         # For security
         # self.update()
 
-        self.sim_type = sim_type
+        # Recompile only if modified or simulation type changed, this has
+        # to be checked before the sim_type setter flags the model as modified
+        ode_fun = getattr(self, 'ode_fun', None)
+        recompile = force \
+                    or self._modified \
+                    or self.sim_type != sim_type \
+                    or ode_fun is None \
+                    or getattr(ode_fun, 'global_cse', False) != global_cse
 
         if not hasattr(self, 'pool'):
             self.pool = Pool(ncpu)
 
-        # Recompile only if modified or simulation
-        if self._modified or self.sim_type != sim_type:
+        if recompile:
+            self.sim_type = sim_type
             # Compile ode function
-            ode_fun, variables = make_ode_fun(self, sim_type, pool=self.pool)
+            ode_fun, variables = make_ode_fun(self, sim_type, pool=self.pool,
+                                              global_cse=global_cse)
             # TODO define the init properly
             self.ode_fun = ode_fun
+            self.ode_jacobian_fun = None
             self.variables = variables
 
             self._modified = False
@@ -340,6 +380,22 @@ class KineticModel(object):
             # serialization)
             self.initial_conditions.update(old_initial_conditions)
 
+        ode_jacobian_fun = getattr(self, 'ode_jacobian_fun', None)
+        if not jacobian and ode_jacobian_fun is not None:
+            # Stop passing a previously compiled jacobian to the solver
+            self.ode_jacobian_fun = None
+            self._recompiled = True
+
+        elif jacobian and (ode_jacobian_fun is None
+                           or getattr(ode_jacobian_fun, 'global_cse', False) != global_cse):
+            self.ode_jacobian_fun = ODEJacobianFunction(self,
+                                                        self.ode_fun.variables,
+                                                        self.ode_fun.expressions,
+                                                        self.ode_fun._parameters,
+                                                        pool=self.pool,
+                                                        global_cse=global_cse)
+            self._recompiled = True
+
     def solve_ode(self, time_out, solver_type='cvode', **kwargs):
         """
 
@@ -355,10 +411,18 @@ class KineticModel(object):
         extra_options = {'old_api': False}
         kwargs.update(extra_options)
 
-        # Choose a solver
+        # Use the analytic jacobian if it was compiled
+        jacobian_fun = getattr(self, 'ode_jacobian_fun', None)
+        if solver_type == 'cvode' and jacobian_fun is not None:
+            kwargs.setdefault('jacfn', jacobian_fun)
+
+        # Choose a solver, rebuild it if the ode function was recompiled or
+        # another solver type is requested
         if not hasattr(self, 'solver')\
-           or self._recompiled:
+           or self._recompiled \
+           or getattr(self, '_solver_type', None) != solver_type:
             self.solver = ode(solver_type, self.ode_fun, **kwargs)
+            self._solver_type = solver_type
             self._recompiled = False
 
         # Order the initial conditions according to variables
@@ -367,6 +431,8 @@ class KineticModel(object):
 
         #Update fixed parameters
         self.ode_fun.get_params()
+        if jacobian_fun is not None:
+            jacobian_fun.get_params()
 
         # #if parameters are empty try to fetch from model
         # if not self.ode_fun._parameter_values:
@@ -378,6 +444,41 @@ class KineticModel(object):
 
         return ODESolution(self, solution)
 
+    def solve_ode_ensemble(self, time_out, parameter_population,
+                           solver_type='cvode', **kwargs):
+        """
+        Solve the ode for every parameter set of a population from the same
+        initial conditions. The compiled ode function and the solver are
+        reused for all parameter sets, only the parameter values are updated.
+
+        :param time_out: The times at which the solutions are evaluated
+        :type time_out:  list(float) or similar
+        :param parameter_population: The parameter sets to simulate
+        :type parameter_population: skimpy.core.parameters.ParameterValuePopulation
+        :param solver_type: must be among ['cvode','ida','dopri5','dop853']
+        :param kwargs:
+        :return: skimpy.core.solution.ODESolutionPopulation
+        """
+        if len(parameter_population) == 0:
+            raise ValueError('The parameter population to simulate is empty')
+
+        # The parameter values of the model are restored after the
+        # simulations
+        parameter_values = {k: p.value for k, p in self.parameters.items()}
+
+        solutions = []
+        try:
+            for this_parameter_set in parameter_population:
+                self.parameters = this_parameter_set
+                solutions.append(self.solve_ode(time_out,
+                                                solver_type=solver_type,
+                                                **kwargs))
+        finally:
+            self.parameters = parameter_values
+
+        index = list(parameter_population.keys())
+        return ODESolutionPopulation(solutions, index=index)
+
     def compile_mca(self, parameter_list=[], mca_type=NET, sim_type=QSSA, ncpu=1):
             """
             Compile MCA expressions: elasticities, jacobian
@@ -118,6 +118,9 @@ class ParameterValuePopulation(object):
     def __len__(self,):
         return len(self._data)
 
+    def keys(self):
+        return self._index.keys()
+
     # Define the iterator
     def __iter__(self):
         self.n = 0
@@ -184,19 +184,38 @@ class Reactor(ABC):
         #     self.metabolites.append(this_metabolite)
         self._modified = True
 
-    def compile_ode(self, sim_type=QSSA, ncpu=1, add_dilution=False, custom_ode_update=None):
+    def compile_ode(self, sim_type=QSSA, ncpu=1, add_dilution=False, custom_ode_update=None,
+                    force=False):
         """
 
+        The ode function is only regenerated if the reactor was modified
+        (i.e. boundary conditions were added) or if the sim_type,
+        add_dilution or custom_ode_update changed since the last
+        compilation. Changes made directly to the models of a compiled
+        reactor are not tracked; use force=True to regenerate the ode
+        function after such changes.
+
         :param sim_type:
         :param ncpu:
+        :param force: If True, regenerate the ode function even if the
+                      reactor was not modified
         :return:
         """
-        self.sim_type = sim_type
+        # Recompile only if modified or the simulation options changed, this
+        # has to be checked before the sim_type is updated
+        ode_options = (add_dilution, custom_ode_update)
+        recompile = force \
+                    or self._modified \
+                    or getattr(self, 'sim_type', None) != sim_type \
+                    or getattr(self, '_ode_options', None) != ode_options \
+                    or getattr(self, 'ode_fun', None) is None
+
         if not hasattr(self, 'pool'):
             self.pool = Pool(ncpu)
 
-        # Recompile only if modified or simulation
-        if self._modified or self.sim_type != sim_type:
+        if recompile:
+            self.sim_type = sim_type
+            self._ode_options = ode_options
             # Compile ode function
             ode_fun, variables = make_reactor_ode_fun(self, sim_type, pool=self.pool,
                                                       add_dilution=add_dilution,
@@ -238,10 +257,13 @@ class Reactor(ABC):
         extra_options = {'old_api': False}
         kwargs.update(extra_options)
 
-        # Choose a solver
+        # Choose a solver, rebuild it if the ode function was recompiled or
+        # another solver type is requested
         if not hasattr(self, 'solver') \
-                or self._recompiled:
+                or self._recompiled \
+                or getattr(self, '_solver_type', None) != solver_type:
             self.solver = ode(solver_type, self.ode_fun, **kwargs)
+            self._solver_type = solver_type
             self._recompiled = False
 
         # Order the initial conditions according to variables
@@ -27,7 +27,7 @@ limitations under the License.
 
 import numpy as np
 from ..viz.plotting import timetrace_plot, plot_population_per_variable
-from ..utils import TabDict,iterable_to_tabdict
+from ..utils import TabDict
 
 from copy import deepcopy
 
@@ -38,17 +38,16 @@ class ODESolution:
     def __init__(self, model, solution):
         self.ode_solution = solution
 
-        self.time    = np.array(solution.values.t)
+        # The solver already returns arrays, avoid copying them
+        self.time    = np.asarray(solution.values.t)
 
-        self.species = np.array(solution.values.y)
+        self.species = np.asarray(solution.values.y)
         self.names = [x for x in model.ode_fun.variables]
 
-        # TODO: Cleanup this
-        concentrations = iterable_to_tabdict([])
-        for this_species, this_name in zip(self.species.T, self.names):
-            concentrations[this_name] = this_species
-
-        self.concentrations = pd.DataFrame.from_dict(concentrations, orient='columns')
+        # Build the data frame from the (time x species) array at once
+        self.concentrations = pd.DataFrame(
+            self.species.reshape(-1, len(self.names)),
+            columns=self.names)
 
     def plot(self, filename='', **kwargs):
         timetrace_plot(self.time, self.species, filename, legend=self.names, **kwargs)
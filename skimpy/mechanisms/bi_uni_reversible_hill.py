@@ -26,7 +26,7 @@ limitations under the License.
 """
 
 
-from sympy import sympify
+from sympy import Dummy, symbols, lambdify
 from numpy import abs as np_abs
 
 from .mechanism import KineticMechanism,ElementrayReactionStep
@@ -79,21 +79,94 @@ class BiUniReversibleHill(KineticMechanism):
 
     ElementaryReactions = namedtuple('ElementaryReactions',[])
 
+    # Arguments of make_rate_expressions and of the numeric rate function
+    rate_arguments = ['substrate1',
+                      'substrate2',
+                      'product',
+                      'km_substrate1',
+                      'km_substrate2',
+                      'km_product',
+                      'hill_coefficient',
+                      'vmax_forward',
+                      'k_equilibrium',
+                      ]
+
+    # Rate expressions built once per class with placeholder symbols and
+    # their lambdified net rate
+    _rate_templates = None
+    _numeric_rate_fn = None
+
     def __init__(self, name, reactants, parameters=None, **kwargs):
         KineticMechanism.__init__(self, name, reactants, parameters, **kwargs)
 
-    def get_qssa_rate_expression(self):
-        reactant_km_relation = {self.reactants[v].symbol: k
-                                for k, v in self.parameter_reactant_links.items()}
+    @staticmethod
+    def make_rate_expressions(s1, s2, p, kms1, kms2, kmp, h, vmaxf, keq):
+        """
+        Build the forward and backward QSSA rate expressions
+
+        :return: forward_rate_expression, backward_rate_expression
+        """
+        # Build the shared terms once
+        s1_kms1 = s1/kms1
+        s2_kms2 = s2/kms2
+        p_kmp = p/kmp
+        s1_s2_p = s1_kms1*s2_kms2 + p_kmp
 
-        substrates = TabDict([(k, self.reactants[k])
-                              for k in self.reactant_list
-                              if k.startswith('substrate')])
+        hill_effect = s1_s2_p**(h-1)
 
-        products = TabDict([(k, self.reactants[k])
-                            for k in self.reactant_list
-                            if k.startswith('product')])
+        fwd_nominator = vmaxf*s1_kms1*s2_kms2*hill_effect
+        bwd_nominator = vmaxf/(keq*kms1*kms2)*p*hill_effect
+
+        common_denominator = 1 + (s1_kms1+p_kmp)**h \
+                             + (s2_kms2+p_kmp)**h \
+                             + s1_s2_p**h \
+                             - 2*p/kmp**h
 
+        forward_rate_expression = fwd_nominator/common_denominator
+        backward_rate_expression = bwd_nominator/common_denominator
+
+        return forward_rate_expression, backward_rate_expression
+
+    @classmethod
+    def get_rate_templates(cls):
+        """
+        The structure of the rate expressions is the same for every
+        reaction, only the symbols differ. Build the expressions once with
+        placeholder symbols, the symbols of a reaction are then substituted
+        with xreplace instead of rebuilding the expressions.
+
+        :return: placeholders, (forward_rate_template, backward_rate_template)
+        """
+        if cls._rate_templates is None:
+            placeholders = tuple(Dummy(x) for x in cls.rate_arguments)
+            cls._rate_templates = (placeholders,
+                                   cls.make_rate_expressions(*placeholders))
+
+        return cls._rate_templates
+
+    @classmethod
+    def get_numeric_rate_fn(cls):
+        """
+        Lambdify the net QSSA rate into a numpy function. The arguments are
+        given in the order of rate_arguments and can be arrays, e.g. to
+        evaluate the rate for an ensemble of parameter sets at once.
+
+        :return: numpy function returning the net rate
+        """
+        if cls._numeric_rate_fn is None:
+            arguments = symbols(cls.rate_arguments)
+            forward_rate_expression, backward_rate_expression = \
+                cls.make_rate_expressions(*arguments)
+            rate_expression = forward_rate_expression - backward_rate_expression
+
+            cls._numeric_rate_fn = lambdify(arguments, rate_expression,
+                                            modules='numpy')
+
+        return cls._numeric_rate_fn
+
+    def get_qssa_rate_expression(self):
+        reactant_km_relation = {self.reactants[r].symbol: k
+                                for r, k in self.get_reactant_parameter_links().items()}
 
         keq = self.parameters.k_equilibrium.symbol
         #TODO EXTEND TO ALL OTHER MECHANISMS
@@ -102,9 +175,9 @@ class BiUniReversibleHill(KineticMechanism):
         else:
             vmaxf = self.parameters.kcat_forward.symbol * \
                     self.reactants.enzyme.symbol
-        s1 = substrates['substrate1'].symbol
-        s2 = substrates['substrate2'].symbol
-        p = products['product'].symbol
+        s1 = self.reactants['substrate1'].symbol
+        s2 = self.reactants['substrate2'].symbol
+        p = self.reactants['product'].symbol
 
         kms1 = self.parameters[reactant_km_relation[s1]].symbol
         kms2 = self.parameters[reactant_km_relation[s2]].symbol
@@ -112,18 +185,16 @@ class BiUniReversibleHill(KineticMechanism):
 
         h = self.parameters.hill_coefficient.symbol
 
-        hill_effect = (s1/kms1*s2/kms2+p/kmp)**(h-1)
+        # Symbols the rate expression is built from
+        used_symbols = {s1, s2, p, kms1, kms2, kmp, h, keq}
+        used_symbols.update(vmaxf.free_symbols)
 
-        fwd_nominator = vmaxf*s1/kms1*s2/kms2*hill_effect
-        bwd_nominator = vmaxf/(keq*kms1*kms2)*p*hill_effect
-
-        common_denominator = 1 + (s1/kms1+p/kmp)**h \
-                             + (s2/kms2+p/kmp)**h \
-                             + (s1/kms1*s2/kms2+p/kmp)**h \
-                             - 2*p/kmp**h
+        placeholders, rate_templates = self.get_rate_templates()
+        substitutions = dict(zip(placeholders,
+                                 (s1, s2, p, kms1, kms2, kmp, h, vmaxf, keq)))
 
-        forward_rate_expression = fwd_nominator/common_denominator
-        backward_rate_expression = bwd_nominator/common_denominator
+        forward_rate_expression, backward_rate_expression = \
+            [t.xreplace(substitutions) for t in rate_templates]
         rate_expression = forward_rate_expression-backward_rate_expression
 
         self.reaction_rates = TabDict([('v_net', rate_expression),
@@ -131,38 +202,20 @@ class BiUniReversibleHill(KineticMechanism):
                                        ('v_bwd', backward_rate_expression),
                                        ])
 
+        # The stoichiometry is a class attribute holding exactly the
+        # substrates and the product
         expressions = {}
-
-        for type, this_substrate in substrates.items():
-            s = this_substrate.symbol
-            stoich = self.reactant_stoichiometry[type]
-            expressions[s] = stoich*rate_expression
-
-        for type, this_product in products.items():
-            p = this_product.symbol
-            stoich = self.reactant_stoichiometry[type]
-            expressions[p] = stoich * rate_expression
+        for type, stoich in self.reactant_stoichiometry.items():
+            expressions[self.reactants[type].symbol] = stoich*rate_expression
 
         self.expressions = expressions
-        self.expression_parameters = self.get_parameters_from_expression(rate_expression)
+        self.expression_parameters = self.get_parameters_from_symbols(used_symbols)
 
     def update_qssa_rate_expression(self):
 
-        substrates = {k:r for k,r in self.reactants.items()
-                      if k.startswith('substrate')}
-
-        products= {k:r for k,r in self.reactants.items()
-                      if k.startswith('product')}
-
-        for type, this_substrate in substrates.items():
-            s = this_substrate.symbol
-            stoich = self.reactant_stoichiometry[type]
-            self.expressions[s] = stoich*self.reaction_rates['v_net']
-
-        for type, this_product in products.items():
-            p = this_product.symbol
-            stoich = self.reactant_stoichiometry[type]
-            self.expressions[p] = stoich*self.reaction_rates['v_net']
+        rate_expression = self.reaction_rates['v_net']
+        for type, stoich in self.reactant_stoichiometry.items():
+            self.expressions[self.reactants[type].symbol] = stoich*rate_expression
 
 
     """"
@@ -35,7 +35,7 @@ from collections import namedtuple
 from ..core.itemsets import make_parameter_set, make_reactant_set
 from skimpy.utils.general import make_subclasses_dict
 from ..utils.namespace import *
-from .utils import stringify_stoichiometry
+from .utils import stringify_stoichiometry, stoichiometric_exponent
 
 
 def make_convenience(stoichiometry):
@@ -122,30 +122,37 @@ def make_convenience(stoichiometry):
             bwd_nominator = vmaxf/keq
 
             for type, this_substrate in substrates.items():
-                common_denominator_this_substrate = 1
                 s = this_substrate.symbol
                 kms = self.parameters[reactant_km_relation[s]].symbol
                 stoich = self.reactant_stoichiometry[type]
+                # 1 + (s/kms) + ... + (s/kms)**|stoich| in Horner form
+                # to avoid evaluating powers
+                s_kms = s/kms
+                common_denominator_this_substrate = 1
                 for alpha in range(int(abs(stoich))):
-                    common_denominator_this_substrate += (s/kms)**(alpha+1)
+                    common_denominator_this_substrate = \
+                        1 + s_kms*common_denominator_this_substrate
                 # Multiply for every substrate
                 common_denominator_substrates *= common_denominator_this_substrate
 
-                fwd_nominator *= (s/kms)**abs(stoich)
-                bwd_nominator *= kms**(-1*abs(stoich))
+                fwd_nominator *= s_kms**stoichiometric_exponent(stoich)
+                bwd_nominator *= kms**(-1*stoichiometric_exponent(stoich))
 
             common_denominator_products = 1
             for type, this_product in products.items():
-                common_denominator_this_product = 1
                 p = this_product.symbol
                 kmp = self.parameters[reactant_km_relation[p]].symbol
                 stoich = self.reactant_stoichiometry[type]
+                # 1 + (p/kmp) + ... + (p/kmp)**|stoich| in Horner form
+                p_kmp = p/kmp
+                common_denominator_this_product = 1
                 for beta in range(int(abs(stoich))):
-                    common_denominator_this_product += (p/kmp)**(beta+1)
+                    common_denominator_this_product = \
+                        1 + p_kmp*common_denominator_this_product
                 # Multiply for every product
                 common_denominator_products *= common_denominator_this_product
 
-                bwd_nominator *= p**abs(stoich)
+                bwd_nominator *= p**stoichiometric_exponent(stoich)
 
             common_denominator = common_denominator_substrates +\
                                  common_denominator_products - 1
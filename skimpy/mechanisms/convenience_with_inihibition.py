@@ -26,16 +26,16 @@ limitations under the License.
 """
 
 
-from sympy import sympify
+from functools import lru_cache
+from sympy import S
 
 from .mechanism import KineticMechanism,ElementrayReactionStep
 from ..core.reactions import Reaction
 from ..utils.tabdict import TabDict
 from collections import namedtuple
 from ..core.itemsets import make_parameter_set, make_reactant_set
-from skimpy.utils.general import make_subclasses_dict
 from ..utils.namespace import *
-from .utils import stringify_stoichiometry
+from .utils import stringify_stoichiometry, stoichiometric_exponent
 
 
 def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
@@ -44,14 +44,14 @@ def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
 
     :param stoichiometry is a list of the reaction stoichioemtry
     """
-    ALL_MECHANISM_SUBCLASSES = make_subclasses_dict(KineticMechanism)
+    # The mechanism classes are cached on the stoichiometries, so every
+    # call with the same stoichiometries returns the same class
+    return _make_convenience_with_inhibition(tuple(stoichiometry),
+                                             tuple(inihbitor_stoichiometry))
 
-    new_class_name = "Convenience"\
-                     + "_{0}".format(stringify_stoichiometry(stoichiometry,
-                                                             inihibitors=inihbitor_stoichiometry))
 
-    if new_class_name in ALL_MECHANISM_SUBCLASSES.keys():
-        return ALL_MECHANISM_SUBCLASSES[new_class_name]
+@lru_cache(maxsize=None)
+def _make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
 
     class ConvenienceInhibited(KineticMechanism):
         """A reversible N-M enyme class with inhibitors as described in:
@@ -66,6 +66,8 @@ def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
                                                        inihibitors=inihbitor_stoichiometry))
 
         reactant_list = []
+        substrate_list = []
+        product_list = []
         inhibitor_list = []
         parameter_list = {'vmax_forward': [ODE, MCA, QSSA],
                           'kcat_forward':[ODE,MCA,QSSA],
@@ -83,6 +85,7 @@ def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
                 substrate = 'substrate{}'.format(num_substrates)
                 km_substrate ='km_substrate{}'.format(num_substrates)
                 reactant_list.append(substrate)
+                substrate_list.append(substrate)
                 parameter_list[km_substrate] = [ODE, MCA, QSSA]
                 parameter_reactant_links[km_substrate] = substrate
                 reactant_stoichiometry[substrate] = float(s)
@@ -92,6 +95,7 @@ def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
                 product = 'product{}'.format(num_products)
                 km_product ='km_product{}'.format(num_products)
                 reactant_list.append(product)
+                product_list.append(product)
                 parameter_list[km_product] = [ODE, MCA, QSSA]
                 parameter_reactant_links[km_product] = product
                 reactant_stoichiometry[product] = float(s)
@@ -120,25 +124,14 @@ def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
             KineticMechanism.__init__(self, name, reactants, parameters, inhibitors=inhibitors, **kwargs)
 
         def get_qssa_rate_expression(self):
-            reactant_km_relation = { }
-
-            for k, v in self.parameter_reactant_links.items():
-                if (v in self.reactants):
-                    reactant_km_relation[self.reactants[v].symbol] = k
-                elif (v in self.inhibitors):
-                    reactant_km_relation[self.inhibitors[v].symbol] = k
+            # The km of a reactant is looked up by its symbol, if a metabolite
+            # is linked in several roles the km of the last linked role is used
+            reactant_km_relation = {}
+            for r, k in self.get_reactant_parameter_links().items():
+                if r in self.reactants:
+                    reactant_km_relation[self.reactants[r].symbol] = k
                 else:
-                    raise KeyError('Link not defined in any list')
-
-            substrates = {k:r for k,r in self.reactants.items()
-                          if k.startswith('substrate')}
-
-            products= {k:r for k,r in self.reactants.items()
-                          if k.startswith('product')}
-
-            inhibitors = {k: r for k, r in self.inhibitors.items()
-                          if k.startswith('inhibitor')}
-
+                    reactant_km_relation[self.inhibitors[r].symbol] = k
 
             keq = self.parameters.k_equilibrium.symbol
             if self.enzyme is None:
@@ -147,44 +140,58 @@ def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
                 vmaxf = self.parameters.kcat_forward.symbol * \
                         self.reactants.enzyme.symbol
 
-            common_denominator_substrates = 1
+            # Symbols the rate expression is built from
+            used_symbols = {keq}
+            used_symbols.update(vmaxf.free_symbols)
+
+            common_denominator_substrates = S.One
             fwd_nominator = vmaxf
             bwd_nominator = vmaxf/keq
 
-            for type, this_substrate in substrates.items():
-                common_denominator_this_substrate = 1
-                s = this_substrate.symbol
+            for type in self.substrate_list:
+                s = self.reactants[type].symbol
                 kms = self.parameters[reactant_km_relation[s]].symbol
                 stoich = self.reactant_stoichiometry[type]
+                used_symbols.update((s, kms))
+                # 1 + (s/kms) + ... + (s/kms)**|stoich| in Horner form
+                # to avoid evaluating powers
+                s_kms = s/kms
+                common_denominator_this_substrate = S.One
                 for alpha in range(int(abs(stoich))):
-                    common_denominator_this_substrate += (s/kms)**(alpha+1)
+                    common_denominator_this_substrate = \
+                        S.One + s_kms*common_denominator_this_substrate
                 # Multiply for every substrate
                 common_denominator_substrates *= common_denominator_this_substrate
 
-                fwd_nominator *= (s/kms)**abs(stoich)
-                bwd_nominator *= kms**(-1*abs(stoich))
+                fwd_nominator *= s_kms**stoichiometric_exponent(stoich)
+                bwd_nominator *= kms**(-1*stoichiometric_exponent(stoich))
 
-            common_denominator_products = 1
-            for type, this_product in products.items():
-                common_denominator_this_product = 1
-                p = this_product.symbol
+            common_denominator_products = S.One
+            for type in self.product_list:
+                p = self.reactants[type].symbol
                 kmp = self.parameters[reactant_km_relation[p]].symbol
                 stoich = self.reactant_stoichiometry[type]
+                used_symbols.update((p, kmp))
+                # 1 + (p/kmp) + ... + (p/kmp)**|stoich| in Horner form
+                p_kmp = p/kmp
+                common_denominator_this_product = S.One
                 for beta in range(int(abs(stoich))):
-                    common_denominator_this_product += (p/kmp)**(beta+1)
+                    common_denominator_this_product = \
+                        S.One + p_kmp*common_denominator_this_product
                 # Multiply for every product
                 common_denominator_products *= common_denominator_this_product
 
-                bwd_nominator *= p**abs(stoich)
+                bwd_nominator *= p**stoichiometric_exponent(stoich)
 
-            common_denominator_inhibitors = 0
-            for type, this_inhibitor in inhibitors.items():
-                i = this_inhibitor.symbol
+            common_denominator_inhibitors = S.Zero
+            for type in self.inhibitor_list:
+                i = self.inhibitors[type].symbol
                 kmi = self.parameters[reactant_km_relation[i]].symbol
+                used_symbols.update((i, kmi))
                 common_denominator_inhibitors += i/kmi
 
             common_denominator = common_denominator_substrates +\
-                                 common_denominator_products - 1\
+                                 common_denominator_products - S.One\
                                  + common_denominator_inhibitors
 
             forward_rate_expression = fwd_nominator/common_denominator
@@ -196,55 +203,41 @@ def make_convenience_with_inhibition(stoichiometry, inihbitor_stoichiometry):
                                            ('v_bwd', backward_rate_expression),
                                            ])
 
-            expressions = {}
-
             # TODO Find a better solution to handle duplicate substrates
             # The dict currently does not allow for this
-            for type, this_substrate in substrates.items():
-                s = this_substrate.symbol
-                stoich = self.reactant_stoichiometry[type]
-                if s in expressions.keys():
+            # The stoichiometry is a class attribute holding exactly the
+            # substrates and products
+            expressions = {}
+            for type, stoich in self.reactant_stoichiometry.items():
+                s = self.reactants[type].symbol
+                if s in expressions:
                     expressions[s] += stoich * rate_expression
                 else:
-                    expressions[s] = stoich*rate_expression
-
-            for type, this_product in products.items():
-                p = this_product.symbol
-                stoich = self.reactant_stoichiometry[type]
-                if p in expressions.keys():
-                    expressions[p] += stoich * rate_expression
-                else:
-                    expressions[p] = stoich*rate_expression
+                    expressions[s] = stoich * rate_expression
 
             self.expressions = expressions
-            self.expression_parameters = self.get_parameters_from_expression(rate_expression)
+            self._expressions_rate = rate_expression
+            self.expression_parameters = self.get_parameters_from_symbols(used_symbols)
 
         def update_qssa_rate_expression(self):
 
-            substrates = {k:r for k,r in self.reactants.items()
-                          if k.startswith('substrate')}
+            rate_expression = self.reaction_rates['v_net']
 
-            products= {k:r for k,r in self.reactants.items()
-                          if k.startswith('product')}
-            
-            expressions = {}
-            for type, this_substrate in substrates.items():
-                s = this_substrate.symbol
-                stoich = self.reactant_stoichiometry[type]
-                if s in expressions.keys():
-                    expressions[s] += stoich * self.reaction_rates['v_net']
-                else:
-                    expressions[s] = stoich*self.reaction_rates['v_net']
+            # The mass balances of get_qssa_rate_expression are still valid
+            # if no modifier replaced the rate expression
+            if rate_expression is getattr(self, '_expressions_rate', None):
+                return
 
-            for type, this_product in products.items():
-                p = this_product.symbol
-                stoich = self.reactant_stoichiometry[type]
-                if p in expressions.keys():
-                    expressions[p] += stoich * self.reaction_rates['v_net']
+            expressions = {}
+            for type, stoich in self.reactant_stoichiometry.items():
+                s = self.reactants[type].symbol
+                if s in expressions:
+                    expressions[s] += stoich * rate_expression
                 else:
-                    expressions[p] = stoich * self.reaction_rates['v_net']
+                    expressions[s] = stoich * rate_expression
 
-                self.expressions = expressions
+            self.expressions = expressions
+            self._expressions_rate = rate_expression
 
 
         """"
@@ -25,6 +25,7 @@ limitations under the License.
 
 """
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from skimpy.core.itemsets import Reactant
 from skimpy.utils.namespace import *
 
@@ -59,6 +60,16 @@ class KineticMechanism(ABC):
     def __reduce__(self):
             return KineticMechanism.__class__.__name__
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_reactant_parameter_links(cls):
+        """
+        Inverse of the class level parameter_reactant_links, computed once
+        per mechanism class
+        :return: dict of parameter names indexed by the reactant role
+        """
+        return {v: k for k, v in cls.parameter_reactant_links.items()}
+
     def link_parameters_and_reactants(self):
         for p,r in self.parameter_reactant_links.items():
             try:
@@ -114,6 +125,15 @@ class KineticMechanism(ABC):
         pass
 
     def get_parameters_from_expression(self, expr):
+        return self.get_parameters_from_symbols(expr.free_symbols)
+
+    def get_parameters_from_symbols(self, symbols):
+        """
+        Parameters among the symbols an expression was built from, this
+        avoids walking the expression tree when the symbols are known
+        :param symbols: the parameter and reactant symbols of the expression
+        :return: set of parameter symbols
+        """
 
         reactants = [x.symbol for x in self.reactants.values()
                                if x.type == VARIABLE]
@@ -122,7 +142,7 @@ class KineticMechanism(ABC):
                          if x.type == VARIABLE]
             reactants += inhibitors
 
-        parameters = set(expr.free_symbols).difference(reactants)
+        parameters = set(symbols).difference(reactants)
 
         return parameters
 
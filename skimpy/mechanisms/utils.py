@@ -44,3 +44,21 @@ def stringify_stoichiometry(stoichiometry, inihibitors = None):
     suffix = suffix.replace('-', 'm')
 
     return suffix
+
+
+def stoichiometric_exponent(stoichiometry):
+    """
+    Stoichiometries are stored as floats e.g. -2.0. Used as exponent a
+    float is kept by sympy as a power (x**1.0, x**2.0) that is evaluated
+    with pow(), an integer exponent is simplified (x) or printed as a
+    product. Return the absolute stoichiometry as int if it is integral.
+    :param stoichiometry:
+    :type stoichiometry: float
+    :return: exponent
+    """
+    exponent = abs(stoichiometry)
+
+    if float(exponent).is_integer():
+        return int(exponent)
+
+    return exponent
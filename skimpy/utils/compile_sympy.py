@@ -48,12 +48,14 @@ INCLUDE = "#include <stdlib.h>\n" \
 FUNCTION_DEFINITION_HEADER = "void function(double *input_array, double *output_array){ \n"
 FUNCTION_DEFINITION_FOOTER = ";\n}"
 
-def make_cython_function(symbols, expressions, quiet=True, simplify=True, optimize=False, pool=None):
+def make_cython_function(symbols, expressions, quiet=True, simplify=True, optimize=False, pool=None,
+                         global_cse=False):
 
     code_expressions = generate_vectorized_code(symbols,
                                                 expressions,
                                                 simplify=simplify,
-                                                pool=pool)
+                                                pool=pool,
+                                                global_cse=global_cse)
 
 
     # Write the code to a temp file
@@ -70,17 +72,16 @@ def make_cython_function(symbols, expressions, quiet=True, simplify=True, optimi
     # Import the function
     fun = ctypes.CDLL(path_to_so_file)
 
-    def this_function(input_array,output_array):
-        # Input pointers
-        fun.function.argtypes = [ctypes.POINTER(ctypes.c_double),
-                                 ctypes.POINTER(ctypes.c_double),]
-        #Cast to numpy float
-        if not type(input_array) ==  np.ndarray.dtype:
-            input_array = np.array(input_array, dtype=np.float)
+    # Bind the C function once and pass the raw data addresses of the
+    # arrays, building ctypes pointer objects at every call is much slower
+    c_function = fun.function
+    c_function.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    c_function.restype = None
 
-        #x.ctypes.data_as(ctypes.POINTER(ctypes.c_long))
-        fun.function(input_array.ctypes.data_as(ctypes.POINTER(ctypes.c_double)) ,
-                     output_array.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), )
+    def this_function(input_array,output_array):
+        # Cast to a contiguous numpy double array (no copy if it already is one)
+        input_array = np.ascontiguousarray(input_array, dtype=np.double)
+        c_function(input_array.ctypes.data, output_array.ctypes.data)
 
     return this_function
 
@@ -93,11 +94,17 @@ def write_code_to_tempfile(code,file_path=None):
         text_file.write(code)
     return file_path
 
-def generate_vectorized_code(inputs, expressions, simplify=True, optimize=False, pool=None):
+def generate_vectorized_code(inputs, expressions, simplify=True, optimize=False, pool=None,
+                             global_cse=False):
     # input substitution dict:
     input_subs = {str(e): "input_array[{}]".format(i)
                   for i, e in enumerate(inputs)}
 
+    if global_cse:
+        # Common sub expressions shared between the expressions (e.g. a rate
+        # in the mass balances of all its reactants) are computed only once
+        return generate_global_cse_code(expressions, input_subs)
+
     if pool is None:
         cython_code = []
         for i,e in enumerate(expressions):
@@ -122,7 +129,38 @@ def generate_vectorized_code(inputs, expressions, simplify=True, optimize=False,
     return cython_code
 
 
-from sympy import cse
+from sympy import cse, numbered_symbols
+
+def generate_global_cse_code(expressions, input_subs):
+    """
+    Generate the code for all expressions at once with a single common sub
+    expression elimination, this can not be parallelized per expression
+    """
+    common_sub_expressions, main_expressions = cse(list(expressions),
+                                                   symbols=numbered_symbols('cse_global_'))
+
+    cython_code = ''
+    for this_cse in common_sub_expressions:
+        cython_code=cython_code+'double {} = {} ;\n'.format(str(this_cse[0]),
+                                                    ccode(this_cse[1],standard='C99'))
+
+    cython_code = cython_code + ';\n'.join(["output_array[{}] = {} ".format(i,ccode(e, standard='C99'))
+                                            for i, e in enumerate(main_expressions)])
+
+    return substitute_code_inputs(cython_code, input_subs)
+
+
+def substitute_code_inputs(cython_code, input_subs):
+    # Substitute integers in the cython code
+    cython_code = re.sub(r"(\ |\+|[^e]\-|\*|\(|\)|\/|\,)([1-9])(\ |\+|\-|\*|\(|\)|\/|\,)",
+                         r"\1 \2.0 \3 ",
+                         cython_code)
+
+    for str_sym, array_sym in input_subs.items():
+        cython_code = re.sub(r"(\ |\+|\-|\*|\(|\)|\/|\,)({})(\ |\+|\-|\*|\(|\)|\/|\,)".format(str_sym),
+                             r"\1 {} \3 ".format(array_sym),
+                             cython_code)
+    return cython_code
 
 def generate_a_code_line_simplfied(input , optimize=False):
     i, e, input_subs = input
@@ -160,17 +198,7 @@ def generate_a_code_line_simplfied(input , optimize=False):
                                                                       ,standard='C99')
                                                               )
 
-    # Substitute integers in the cython code
-    cython_code = re.sub(r"(\ |\+|[^e]\-|\*|\(|\)|\/|\,)([1-9])(\ |\+|\-|\*|\(|\)|\/|\,)",
-                         r"\1 \2.0 \3 ",
-                         cython_code)
-
-    for str_sym, array_sym in input_subs.items():
-        cython_code = re.sub(r"(\ |\+|\-|\*|\(|\)|\/|\,)({})(\ |\+|\-|\*|\(|\)|\/|\,)".format(str_sym),
-                             r"\1 {} \3 ".format(array_sym),
-                             cython_code)
-
-    return cython_code
+    return substitute_code_inputs(cython_code, input_subs)
 
 
 def generate_a_code_line(input, optimize=False):
@@ -181,14 +209,4 @@ def generate_a_code_line(input, optimize=False):
     else:
         cython_code = "output_array[{}] = {} ".format(i,ccode(e, standard='C99'))
 
-
-    # Substitute integers in the cython code
-    cython_code = re.sub(r"(\ |\+|[^e]\-|\*|\(|\)|\/|\,)([1-9])(\ |\+|\-|\*|\(|\)|\/|\,)",
-                         r"\1 \2.0 \3 ",
-                         cython_code)
-
-    for str_sym, array_sym in input_subs.items():
-        cython_code = re.sub(r"(\ |\+|\-|\*|\(|\)|\/|\,)({})(\ |\+|\-|\*|\(|\)|\/|\,)".format(str_sym),
-                             r"\1 {} \3 ".format(array_sym),
-                             cython_code)
-    return cython_code
\ No newline at end of file
+    return substitute_code_inputs(cython_code, input_subs)
\ No newline at end of file
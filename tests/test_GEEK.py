@@ -130,3 +130,144 @@ def test_geek_kinetics():
         this_model.initial_conditions[c]=v
 
     this_model.solve_ode(time_out=np.linspace(0,100,1000))
+
+
+def compile_linear_GEEK(**compile_kwargs):
+    """
+    Build and compile the linear GEEK pathway with its reference boundary
+    and initial concentrations
+    """
+    concentration_dict = {'A': 3.0, 'B': 2.0, 'C': 1.0, 'D': 0.5}
+
+    this_model = build_linear_GEEK_pathway_model()
+
+    this_model.parameters.A.value = 3.0
+    this_model.parameters.D.value = 0.5
+
+    this_model.compile_ode(sim_type=QSSA, **compile_kwargs)
+
+    for c,v in concentration_dict.items():
+        this_model.initial_conditions[c]=v
+
+    return this_model
+
+
+def solve_linear_GEEK(**compile_kwargs):
+    this_model = compile_linear_GEEK(**compile_kwargs)
+    return this_model.solve_ode(time_out=np.linspace(0,100,1000))
+
+
+def test_geek_kinetics_analytic_jacobian():
+    solutions = [solve_linear_GEEK(jacobian=jacobian)
+                 for jacobian in [False, True]]
+
+    # The analytic jacobian must not change the solution
+    assert np.allclose(solutions[0].species, solutions[1].species,
+                       rtol=1e-3, atol=1e-6)
+
+
+def test_geek_kinetics_analytic_jacobian_finite_differences():
+    this_model = compile_linear_GEEK(jacobian=True)
+
+    ode_fun = this_model.ode_fun
+    jacobian_fun = this_model.ode_jacobian_fun
+    ode_fun.get_params()
+    jacobian_fun.get_params()
+
+    y = np.array([this_model.initial_conditions[v] for v in ode_fun.variables])
+    n = len(y)
+
+    jacobian = np.zeros((n, n))
+    jacobian_fun(0.0, y, None, jacobian)
+
+    # Central finite differences of the compiled ode function, this
+    # includes the variables held by a boundary condition (A)
+    eps = 1e-6
+    finite_differences = np.zeros((n, n))
+    for j in range(n):
+        dy = np.zeros(n)
+        dy[j] = eps
+        ydot_plus = np.zeros(n)
+        ydot_minus = np.zeros(n)
+        ode_fun(0.0, y + dy, ydot_plus)
+        ode_fun(0.0, y - dy, ydot_minus)
+        finite_differences[:, j] = (ydot_plus - ydot_minus) / (2 * eps)
+
+    assert np.allclose(jacobian, finite_differences, rtol=1e-6, atol=1e-8)
+
+
+def test_geek_kinetics_global_cse():
+    solutions = [solve_linear_GEEK(global_cse=global_cse)
+                 for global_cse in [False, True]]
+
+    # Eliminating the common sub expressions globally must not change the solution
+    assert np.allclose(solutions[0].species, solutions[1].species)
+
+
+def test_geek_kinetics_compile_once():
+    this_model = build_linear_GEEK_pathway_model()
+
+    this_model.compile_ode(sim_type=QSSA)
+    ode_fun = this_model.ode_fun
+
+    # An unmodified model is not recompiled
+    this_model.compile_ode(sim_type=QSSA)
+    assert this_model.ode_fun is ode_fun
+
+    # Unless explicitly requested
+    this_model.compile_ode(sim_type=QSSA, force=True)
+    assert this_model.ode_fun is not ode_fun
+
+    # or the code generation options changed
+    ode_fun = this_model.ode_fun
+    this_model.compile_ode(sim_type=QSSA, global_cse=True)
+    assert this_model.ode_fun is not ode_fun
+
+    # The jacobian is only kept while it is requested
+    this_model.compile_ode(sim_type=QSSA, global_cse=True, jacobian=True)
+    assert this_model.ode_jacobian_fun is not None
+    this_model.compile_ode(sim_type=QSSA, global_cse=True)
+    assert this_model.ode_jacobian_fun is None
+
+
+def test_geek_kinetics_ensemble():
+    this_model = compile_linear_GEEK()
+
+    parameters = {k: p.value for k, p in this_model.parameters.items()}
+    parameter_sets = []
+    for vmax_forward in [1.0, 5.0]:
+        this_parameter_set = dict(parameters)
+        this_parameter_set['vmax_forward_E1'] = vmax_forward
+        parameter_sets.append(this_parameter_set)
+
+    population = ParameterValuePopulation(parameter_sets, kmodel=this_model)
+
+    time_out = np.linspace(0,100,1000)
+    ensemble = this_model.solve_ode_ensemble(time_out, population)
+
+    # The parameters of the model are not changed by the ensemble
+    assert {k: p.value for k, p in this_model.parameters.items()} == parameters
+
+    # Every member is the solution for its own parameter set
+    for i, this_parameter_set in zip(population.keys(), parameter_sets):
+        this_model.parameters = this_parameter_set
+        solution = this_model.solve_ode(time_out)
+
+        this_solution = ensemble.data[ensemble.data.solution_id == i]
+        assert np.allclose(this_solution[solution.names].values,
+                           solution.species)
+
+    # The members differ
+    first, second = [ensemble.data[ensemble.data.solution_id == i]
+                     for i in population.keys()]
+    assert not np.allclose(first[solution.names].values,
+                           second[solution.names].values)
+
+
+def test_geek_kinetics_empty_ensemble():
+    this_model = compile_linear_GEEK()
+
+    population = ParameterValuePopulation([], kmodel=this_model)
+
+    with pytest.raises(ValueError):
+        this_model.solve_ode_ensemble(np.linspace(0,100,1000), population)
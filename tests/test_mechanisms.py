@@ -0,0 +1,149 @@
+import pytest
+
+import numpy as np
+
+from skimpy.core import *
+from skimpy.mechanisms import *
+from skimpy.utils.namespace import *
+
+
+def assert_rate_value(reaction, rate_expression, concentrations, expected):
+    """Check a symbolic rate against an expected value, substituting the
+    concentrations and the parameter values of the reaction"""
+    values = dict(concentrations)
+    values.update({str(p.symbol): p.value for p in reaction.parameters.values()
+                   if p.value is not None})
+    subs = {s: values[str(s)] for s in rate_expression.free_symbols}
+    assert np.isclose(float(rate_expression.subs(subs)), expected)
+
+
+def test_bi_uni_reversible_hill_numeric_rate():
+    metabolites = BiUniReversibleHill.Reactants(substrate1='A',
+                                                substrate2='B',
+                                                product='C')
+
+    reaction = Reaction(name='BiUni',
+                        mechanism=BiUniReversibleHill,
+                        reactants=metabolites,
+                        )
+
+    parameters = BiUniReversibleHill.Parameters(vmax_forward=1.0,
+                                                k_equilibrium=5.0,
+                                                hill_coefficient=1.5,
+                                                km_substrate1=10.0,
+                                                km_substrate2=3.0,
+                                                km_product=1.0)
+
+    reaction.parametrize(parameters)
+    reaction.mechanism.get_qssa_rate_expression()
+    rate_expression = reaction.mechanism.reaction_rates['v_net']
+
+    rate_fn = BiUniReversibleHill.get_numeric_rate_fn()
+    # The rate is only lambdified once per class
+    assert BiUniReversibleHill.get_numeric_rate_fn() is rate_fn
+
+    # Evaluate the rate for an ensemble of vmax values at once
+    vmax = np.linspace(0.5, 2.0, 5)
+    rates = rate_fn(1.0, 2.0, 0.5, 10.0, 3.0, 1.0, 1.5, vmax, 5.0)
+
+    for this_vmax, this_rate in zip(vmax, rates):
+        reaction.parameters['vmax_forward'].value = this_vmax
+        assert_rate_value(reaction, rate_expression,
+                          {'A': 1.0, 'B': 2.0, 'C': 0.5}, this_rate)
+
+
+def test_convenience_with_inhibition_update_without_products():
+    ConvenienceInhibited = make_convenience_with_inhibition([-1], [1])
+
+    metabolites = ConvenienceInhibited.Reactants(substrate1='A')
+    inhibitors = ConvenienceInhibited.Inhibitors(inhibitor1='I')
+
+    reaction = Reaction(name='conv',
+                        mechanism=ConvenienceInhibited,
+                        reactants=metabolites,
+                        inhibitors=inhibitors,
+                        )
+
+    parameters = ConvenienceInhibited.Parameters(vmax_forward=1.0,
+                                                 k_equilibrium=2.0,
+                                                 km_substrate1=10.0,
+                                                 ki_inhibitor1=5.0)
+
+    reaction.parametrize(parameters)
+    mechanism = reaction.mechanism
+    mechanism.get_qssa_rate_expression()
+
+    # Replace the rate as a modifier would do
+    modified_rate = 2 * mechanism.reaction_rates['v_net']
+    mechanism.reaction_rates['v_net'] = modified_rate
+    mechanism.update_qssa_rate_expression()
+
+    substrate = mechanism.reactants.substrate1.symbol
+    assert mechanism.expressions[substrate] == -1.0 * modified_rate
+
+
+def test_bi_uni_reversible_hill_identical_substrates():
+    # Both substrates are the same metabolite, the km are looked up by
+    # reactant symbol so the km of the last linked role is used for both
+    metabolites = BiUniReversibleHill.Reactants(substrate1='A',
+                                                substrate2='A',
+                                                product='C')
+
+    reaction = Reaction(name='BiUni',
+                        mechanism=BiUniReversibleHill,
+                        reactants=metabolites,
+                        )
+
+    parameters = BiUniReversibleHill.Parameters(vmax_forward=1.0,
+                                                k_equilibrium=5.0,
+                                                hill_coefficient=1.5,
+                                                km_substrate1=10.0,
+                                                km_substrate2=3.0,
+                                                km_product=1.0)
+
+    reaction.parametrize(parameters)
+    reaction.mechanism.get_qssa_rate_expression()
+    rate_expression = reaction.mechanism.reaction_rates['v_net']
+
+    assert reaction.parameters['km_substrate1'].symbol \
+        not in reaction.mechanism.expression_parameters
+
+    rate_fn = BiUniReversibleHill.get_numeric_rate_fn()
+    rate = rate_fn(2.0, 2.0, 0.5, 3.0, 3.0, 1.0, 1.5, 1.0, 5.0)
+
+    assert_rate_value(reaction, rate_expression, {'A': 2.0, 'C': 0.5}, rate)
+
+
+def test_convenience_with_inhibition_product_inhibition():
+    # The product also inhibits, the km are looked up by reactant symbol
+    # so the inhibition constant is used as the km of the product
+    ConvenienceInhibited = make_convenience_with_inhibition([-1, 1], [1])
+
+    metabolites = ConvenienceInhibited.Reactants(substrate1='A',
+                                                 product1='B')
+    inhibitors = ConvenienceInhibited.Inhibitors(inhibitor1='B')
+
+    reaction = Reaction(name='conv',
+                        mechanism=ConvenienceInhibited,
+                        reactants=metabolites,
+                        inhibitors=inhibitors,
+                        )
+
+    parameters = ConvenienceInhibited.Parameters(vmax_forward=1.0,
+                                                 k_equilibrium=2.0,
+                                                 km_substrate1=10.0,
+                                                 km_product1=4.0,
+                                                 ki_inhibitor1=5.0)
+
+    reaction.parametrize(parameters)
+    reaction.mechanism.get_qssa_rate_expression()
+    rate_expression = reaction.mechanism.reaction_rates['v_net']
+
+    assert reaction.parameters['km_product1'].symbol \
+        not in reaction.mechanism.expression_parameters
+
+    a, b = 3.0, 2.0
+    denominator = (1 + a/10.0) + (1 + b/5.0) - 1 + b/5.0
+    rate = (1.0*a/10.0 - 1.0/2.0*b/10.0)/denominator
+
+    assert_rate_value(reaction, rate_expression, {'A': a, 'B': b}, rate)